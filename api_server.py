@@ -1,65 +1,194 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header, Request, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from contextlib import asynccontextmanager
-from database import GraphDatabaseDriver
-from response_generator import ResponseGenerator
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, ConfigDict, ValidationError
+from contextlib import AsyncExitStack, asynccontextmanager
+from database import AsyncGraphDatabaseDriver
+from response_generator import get_response_generator
 from text_to_cypher import TextToCypher
 from draft_system import DraftSystem
+from semantic_cache import SemanticCache
+from config import load_config
 from typing import List, Optional
-import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+import asyncio
+import hashlib
+import hmac
+import logging
+import logging.handlers
+import orjson
+import pathlib
+import queue
+import time
 import os
 
+logger = logging.getLogger("ml_rag")
+
+# Schema dibaca sekali saat import dan dipakai bersama oleh TextToCypher dan ResponseGenerator
+schema = pathlib.Path("schema_example.txt").read_bytes().decode().strip()
+
 # Global variables
-schema = ""
 ttc = None
 generator = None
 driver = None
 draft_system = None
+semantic_cache = None
+executor = None
+
+# /stats dan /draft/heroes hanya berubah saat KG di-reload
+STATS_TTL = 300  # detik
+stats_cache = {}  # ts_bucket -> (JSON bytes, ETag)
+
+# Query /stats sebagai konstanta agar string identik dan plan cache Neo4j terpakai
+COUNT_HEROES_Q = "MATCH (h:Hero) RETURN count(h) AS count"
+ROLE_COUNTS_Q = "MATCH (h:Hero)-[:HAS_ROLE]->(r:Role) RETURN r.name AS role, count(h) AS count ORDER BY count DESC"
+REL_COUNT_Q = "MATCH ()-[r]->() RETURN count(r) AS count"
+
+# Validasi lane untuk /draft
+LANES = ("gold", "jungle", "roam", "mid", "exp")
+VALID_LANES = frozenset(LANES)
+INVALID_LANE_DETAIL = f"Invalid lane. Must be one of: {', '.join(LANES)}"
+
+# Batas panggilan LLM yang berjalan bersamaan per worker (kuota/rate limit Gemini)
+LLM_MAX_CONCURRENCY = 16
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+async def run_blocking(fn, *args):
+    """Jalankan fungsi blocking di executor agar event loop tidak tertahan"""
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+# Komponen berat di-load saat pertama kali dibutuhkan (lazy), dijaga lock
+# agar request yang datang bersamaan tidak memicu inisialisasi ganda
+ttc_lock = asyncio.Lock()
+generator_lock = asyncio.Lock()
+draft_system_lock = asyncio.Lock()
+
+async def get_ttc():
+    global ttc
+    if ttc is None:
+        async with ttc_lock:
+            if ttc is None:
+                logger.info("⏳ Loading Text-to-Cypher model...")
+                ttc = await run_blocking(TextToCypher, schema)
+                logger.info("✅ Text-to-Cypher ready")
+    return ttc
+
+async def get_generator():
+    global generator
+    if generator is None:
+        async with generator_lock:
+            if generator is None:
+                logger.info("⏳ Loading Response Generator model (ini mungkin lama ~3-5 menit)...")
+                generator = await run_blocking(get_response_generator, schema)
+                logger.info("✅ Response Generator ready")
+    return generator
+
+async def get_draft_system():
+    global draft_system
+    if draft_system is None:
+        async with draft_system_lock:
+            if draft_system is None:
+                logger.info("⏳ Loading Draft System...")
+                draft_system = await run_blocking(DraftSystem)
+                logger.info("✅ Draft System ready")
+    return draft_system
+
+async def warm_up(getter, warmup_call=None):
+    """
+    Load komponen di background; kegagalan di-log dan dicoba lagi saat request pertama.
+    Jika warmup_call diberikan, coroutine tersebut di-await sekali (output dibuang) lewat
+    jalur async yang sama dengan /chat, agar async client Gemini sudah siap saat request pertama.
+    """
+    try:
+        await getter()
+        if warmup_call is not None:
+            await warmup_call()
+    except Exception as e:
+        logger.exception("❌ Warm-up %s failed: %s", getter.__name__, e)
+
+async def generate_cypher(question: str):
+    pipeline = await get_ttc()
+    async with llm_semaphore:
+        return await pipeline.generate_async(question)
+
+async def generate_answer(question: str, query: str, query_result_str: str):
+    pipeline = await get_generator()
+    async with llm_semaphore:
+        return await pipeline.generate_async(question, query, query_result_str)
+
+async def cancel_tasks(tasks: list[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifecycle manager for startup and shutdown"""
-    global schema, ttc, generator, driver, draft_system
+    global driver, semantic_cache, executor
     
-    # Startup
-    print("🚀 Initializing RAG system...")
-    
-    # Load schema
-    with open("schema_example.txt") as fp:
-        schema = fp.read().strip()
-    print("✅ Schema loaded")
-    
-    # Initialize Text-to-Cypher
-    print("⏳ Loading Text-to-Cypher model...")
-    ttc = TextToCypher(schema)
-    print("✅ Text-to-Cypher ready")
-    
-    # Initialize Response Generator
-    print("⏳ Loading Response Generator model (ini mungkin lama ~3-5 menit)...")
-    generator = ResponseGenerator(schema)
-    print("✅ Response Generator ready")
-    
-    # Initialize database connection
-    driver = GraphDatabaseDriver()
-    driver.__enter__()
-    print("✅ Database connected")
-    
-    # Initialize Draft System
-    print("⏳ Loading Draft System...")
-    draft_system = DraftSystem()
-    print("✅ Draft System ready")
-    
-    print("🎉 RAG system ready!")
-    
-    yield
-    
-    # Shutdown
-    if driver:
-        driver.__exit__(None, None, None)
-    print("👋 Server shutdown")
+    # Semua resource didaftarkan ke exit stack sehingga shutdown (urutan terbalik)
+    # tetap berjalan walaupun inisialisasi berikutnya gagal
+    async with AsyncExitStack() as stack:
+        # Startup
+        # Logging lewat QueueHandler agar I/O terjadi di thread listener, bukan di request path
+        log_queue = queue.Queue(-1)
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        log_listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler())
+        logger.addHandler(queue_handler)
+        logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        logger.propagate = False
+        log_listener.start()
+        stack.callback(logger.removeHandler, queue_handler)
+        stack.callback(log_listener.stop)
+        stack.callback(print, "👋 Server shutdown")
+        
+        print("🚀 Initializing RAG system...")
+        
+        # Thread pool untuk panggilan blocking (embedding, draft system, inisialisasi model)
+        executor = ThreadPoolExecutor(max_workers=4)
+        stack.callback(executor.shutdown, wait=False, cancel_futures=True)
+        
+        # Initialize semantic cache
+        print("⏳ Loading semantic cache...")
+        semantic_cache = SemanticCache(backend=os.getenv("EMBEDDING_BACKEND", "torch"))
+        await run_blocking(semantic_cache.embed, "warmup")
+        print("✅ Semantic cache ready")
+        
+        # Initialize database connection
+        driver = await stack.enter_async_context(AsyncGraphDatabaseDriver())
+        print("✅ Database connected")
+        
+        # Precompute payload /stats
+        await get_stats_payload()
+        print("✅ Stats payload cached")
+        
+        # Load Text-to-Cypher, Response Generator dan Draft System di background
+        # WARMUP_LLM=0 untuk melewati dummy call ke Gemini (hemat kuota)
+        warmup_llm = os.getenv("WARMUP_LLM", "1") != "0"
+        warmup_tasks = [
+            asyncio.create_task(warm_up(get_draft_system)),
+            asyncio.create_task(warm_up(
+                get_ttc,
+                partial(generate_cypher, "warmup") if warmup_llm else None
+            )),
+            asyncio.create_task(warm_up(
+                get_generator,
+                partial(generate_answer, "warmup", "MATCH (n) RETURN n LIMIT 1", "(no results)") if warmup_llm else None
+            )),
+        ]
+        stack.push_async_callback(cancel_tasks, warmup_tasks)
+        
+        print("🎉 RAG system ready!")
+        
+        yield
 
-app = FastAPI(title="Mobile Legends RAG API", lifespan=lifespan)
+app = FastAPI(
+    title="Mobile Legends RAG API",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # CORS middleware untuk Next.js
 # Allow localhost for development and production URLs
@@ -82,6 +211,8 @@ app.add_middleware(
 )
 
 class ChatRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+    
     question: str
 
 class ChatResponse(BaseModel):
@@ -90,9 +221,11 @@ class ChatResponse(BaseModel):
     results: list
     answer: str
     success: bool
-    error: str = None
+    error: Optional[str] = None
 
 class DraftRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid", str_strip_whitespace=True)
+    
     banned: List[str] = []
     enemy: List[str] = []
     team: List[str] = []
@@ -103,7 +236,7 @@ class DraftResponse(BaseModel):
     team_analysis: Optional[dict] = None
     enemy_threats: Optional[List[dict]] = None
     success: bool
-    error: str = None
+    error: Optional[str] = None
 
 @app.get("/")
 async def root():
@@ -115,82 +248,148 @@ async def root():
             "POST /chat": "Send a question and get AI response",
             "GET /stats": "Get database statistics",
             "POST /draft": "Get hero draft recommendations",
-            "GET /draft/heroes": "Get all available heroes"
+            "GET /draft/heroes": "Get all available heroes",
+            "POST /admin/cache/clear": "Invalidate cached responses (requires X-Admin-Token)"
         }
     }
 
-@app.post("/chat", response_model=ChatResponse)
-async def chat(request: ChatRequest):
+def format_query_results(display: list, overflow: int):
+    """Format hasil query (yang sudah dipotong) untuk prompt response generator"""
+    if not display:
+        return "(no results)"
+    
+    query_result_str = "\n".join(map(str, display))
+    if overflow > 0:
+        query_result_str += f"\n... and {overflow} more"
+    return query_result_str
+
+def chat_response(question: str, query: str, results: list, answer: str):
+    """Serialisasi ChatResponse langsung ke bytes (tanpa validasi ulang response_model)"""
+    return Response(
+        content=orjson.dumps({
+            "question": question,
+            "cypher_query": query,
+            "results": results,
+            "answer": answer,
+            "success": True,
+            "error": None
+        }, default=str),
+        media_type="application/json"
+    )
+
+@app.post(
+    "/chat",
+    responses={200: {"model": ChatResponse}},
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": ChatRequest.model_json_schema()}},
+            "required": True
+        }
+    }
+)
+async def chat(request: Request):
     """
     Main chat endpoint
     """
+    # Validasi langsung dari raw bytes (pydantic-core), tanpa lewat dict
+    try:
+        chat_request = ChatRequest.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])}
+            for error in e.errors(include_url=False)
+        ])
+    
     try:
-        question = request.question.strip()
+        question = chat_request.question
         
         if not question:
             raise HTTPException(status_code=400, detail="Question cannot be empty")
         
+        logger.debug("💬 Question: %s", question)
+        
+        # Cek semantic cache sebelum memanggil LLM dan database
+        question_vec = await run_blocking(semantic_cache.embed, question)
+        cached = semantic_cache.lookup(question_vec)
+        if cached:
+            cached_question, query, results, answer = cached
+            logger.debug("⚡ Cache hit: %s", cached_question)
+            return chat_response(question, query, results, answer)
+        
         # Generate Cypher query
-        print(f"\n💬 Question: {question}")
-        query = ttc(question)
-        print(f"🔍 Generated query: {query}")
+        query = await generate_cypher(question)
+        logger.debug("🔍 Generated query: %s", query)
         
         # Execute query
         try:
-            results = driver.execute_query(query)
-            print(f"✅ Query executed: {len(results)} results")
+            results = await driver.execute_query(query)
+            logger.debug("✅ Query executed: %d results", len(results))
         except Exception as e:
-            print(f"❌ Query failed: {e}")
+            logger.error("❌ Query failed: %s", e)
             raise HTTPException(status_code=500, detail=f"Query execution failed: {str(e)}")
         
         # Limit results untuk response
         display_limit = 20
-        if len(results) > display_limit:
-            query_result_str = "\n".join([str(x) for x in results[:display_limit]])
-            query_result_str += f"\n... and {len(results) - display_limit} more"
-        else:
-            query_result_str = "\n".join([str(x) for x in results]) if results else "(no results)"
+        display = results[:display_limit]
+        overflow = len(results) - len(display)
+        query_result_str = await run_blocking(format_query_results, display, overflow)
         
         # Generate response
-        print("🤖 Generating response...")
-        answer = generator(question, query, query_result_str)
-        print(f"✅ Answer: {answer}")
+        logger.debug("🤖 Generating response...")
+        answer = await generate_answer(question, query, query_result_str)
+        logger.debug("✅ Answer: %s", answer)
         
-        return ChatResponse(
-            question=question,
-            cypher_query=query,
-            results=results[:display_limit] if results else [],
-            answer=answer,
-            success=True
-        )
+        semantic_cache.add(question_vec, question, query, display, answer)
+        
+        return chat_response(question, query, display, answer)
         
     except Exception as e:
-        print(f"❌ Error: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+def make_etag(content: bytes):
+    return '"' + hashlib.blake2b(content, digest_size=8).hexdigest() + '"'
+
+def cached_json_response(request: Request, content: bytes, etag: str):
+    """Response JSON dengan ETag; balas 304 jika client sudah punya versi yang sama"""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={STATS_TTL}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # Weak comparison (RFC 9110): proxy/CDN yang mengompresi bisa mengubah "abc" menjadi W/"abc"
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if "*" in tags or etag.removeprefix("W/") in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=content, media_type="application/json", headers=headers)
+
+async def get_stats_payload():
+    """Statistik database dalam bentuk (JSON bytes, ETag), di-cache per STATS_TTL detik"""
+    ts_bucket = int(time.time() // STATS_TTL)
+    cached = stats_cache.get(ts_bucket)
+    if cached is not None:
+        return cached
+    
+    # Ketiga query independen, jalankan paralel
+    hero_q, rel_q, roles = await asyncio.gather(
+        driver.execute_query(COUNT_HEROES_Q),
+        driver.execute_query(REL_COUNT_Q),
+        driver.execute_query(ROLE_COUNTS_Q),
+    )
+    
+    content = orjson.dumps({
+        "total_heroes": hero_q[0]['count'],
+        "total_relationships": rel_q[0]['count'],
+        "heroes_by_role": roles
+    })
+    stats_cache.clear()
+    stats_cache[ts_bucket] = (content, make_etag(content))
+    return stats_cache[ts_bucket]
+
 @app.get("/stats")
-async def get_stats():
+async def get_stats(request: Request):
     """Get database statistics"""
     try:
-        # Count total heroes
-        hero_count = driver.execute_query("MATCH (h:Hero) RETURN count(h) AS count")[0]['count']
-        
-        # Count by role
-        roles = driver.execute_query("""
-            MATCH (h:Hero)-[:HAS_ROLE]->(r:Role)
-            RETURN r.name AS role, count(h) AS count
-            ORDER BY count DESC
-        """)
-        
-        # Count relationships
-        rel_count = driver.execute_query("MATCH ()-[r]->() RETURN count(r) AS count")[0]['count']
-        
-        return {
-            "total_heroes": hero_count,
-            "total_relationships": rel_count,
-            "heroes_by_role": roles
-        }
+        content, etag = await get_stats_payload()
+        return cached_json_response(request, content, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -206,29 +405,23 @@ async def get_draft_recommendations(request: DraftRequest):
     - user_lane: Lane position user wants to fill (gold/jungle/roam/mid/exp)
     """
     try:
-        if not draft_system:
-            raise HTTPException(status_code=503, detail="Draft system not initialized")
-        
         # Validate user_lane
-        valid_lanes = ["gold", "jungle", "roam", "mid", "exp"]
-        if request.user_lane not in valid_lanes:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Invalid lane. Must be one of: {', '.join(valid_lanes)}"
-            )
+        if request.user_lane not in VALID_LANES:
+            raise HTTPException(status_code=400, detail=INVALID_LANE_DETAIL)
         
         # Get recommendations
-        print(f"\n🎮 Draft Request:")
-        print(f"   Banned: {request.banned}")
-        print(f"   Enemy: {request.enemy}")
-        print(f"   Team: {request.team}")
-        print(f"   Lane: {request.user_lane}")
+        draft_system = await get_draft_system()
+        logger.debug(
+            "🎮 Draft Request: banned=%s enemy=%s team=%s lane=%s",
+            request.banned, request.enemy, request.team, request.user_lane
+        )
         
-        result = draft_system.get_draft_recommendation(
-            banned=request.banned,
-            enemy=request.enemy,
-            team=request.team,
-            user_lane=request.user_lane
+        result = await run_blocking(
+            draft_system.get_draft_recommendation,
+            request.banned,
+            request.enemy,
+            request.team,
+            request.user_lane
         )
         
         # Convert to response format
@@ -252,7 +445,7 @@ async def get_draft_recommendations(request: DraftRequest):
                 "lane_validation": result.team_analysis.lane_validation
             }
         
-        print(f"✅ Generated {len(recommendations)} recommendations")
+        logger.debug("✅ Generated %d recommendations", len(recommendations))
         
         return DraftResponse(
             recommendations=recommendations,
@@ -262,34 +455,68 @@ async def get_draft_recommendations(request: DraftRequest):
         )
         
     except Exception as e:
-        print(f"❌ Draft Error: {e}")
-        traceback.print_exc()
+        logger.exception("❌ Draft Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@lru_cache(maxsize=1)
+def heroes_payload_cached(draft_system: DraftSystem):
+    """Daftar semua hero beserta atributnya dalam bentuk (JSON bytes, ETag)"""
+    heroes_data = []
+    for hero in sorted(draft_system.heroes):
+        heroes_data.append({
+            "name": hero,
+            "roles": draft_system.hero_roles.get(hero, []),
+            "lanes": draft_system.hero_lanes.get(hero, []),
+            "damage_types": draft_system.hero_damage_types.get(hero, [])
+        })
+    
+    content = orjson.dumps({
+        "total": len(heroes_data),
+        "heroes": heroes_data
+    })
+    return content, make_etag(content)
+
 @app.get("/draft/heroes")
-async def get_all_heroes():
+async def get_all_heroes(request: Request):
     """Get list of all available heroes with their attributes"""
     try:
-        if not draft_system:
-            raise HTTPException(status_code=503, detail="Draft system not initialized")
-        
-        heroes_data = []
-        for hero in sorted(draft_system.heroes):
-            heroes_data.append({
-                "name": hero,
-                "roles": draft_system.hero_roles.get(hero, []),
-                "lanes": draft_system.hero_lanes.get(hero, []),
-                "damage_types": draft_system.hero_damage_types.get(hero, [])
-            })
-        
-        return {
-            "total": len(heroes_data),
-            "heroes": heroes_data
-        }
+        draft_system = await get_draft_system()
+        content, etag = await run_blocking(heroes_payload_cached, draft_system)
+        return cached_json_response(request, content, etag)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/admin/cache/clear")
+async def clear_caches(x_admin_token: Optional[str] = Header(None)):
+    """Invalidate cached payloads setelah KG di-reload (hanya di worker yang menerima request)"""
+    admin_token = load_config().get_admin_token()
+    if not admin_token or not hmac.compare_digest((x_admin_token or "").encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
+    
+    stats_cache.clear()
+    heroes_payload_cached.cache_clear()
+    semantic_cache.clear()
+    
+    # Cache disimpan per proses; dengan >1 worker, worker lain tetap memakai cache lama sampai restart
+    return {
+        "success": True,
+        "scope": "worker",
+        "worker_pid": os.getpid(),
+        "detail": "Only this worker's caches were cleared; restart the server when running multiple workers"
+    }
+
 if __name__ == "__main__":
     import uvicorn
     print("Starting Mobile Legends RAG API server...")
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # loop/http "auto" memakai uvloop + httptools jika terpasang (uvloop tidak tersedia di Windows).
+    # Default 1 worker: setiap worker memegang model dan cache sendiri, dan
+    # /admin/cache/clear hanya me-reset cache worker yang menerima request.
+    uvicorn.run(
+        "api_server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto",
+        log_level="info"
+    )
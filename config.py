@@ -1,11 +1,14 @@
 import tomllib
 import os
+from functools import cached_property, lru_cache
 
 class Config:
     def __init__(self, data: dict[str]):
         self._data = data
     
-    def get_neo4j_driver_kwargs(self):
+    # Nilai digabung (env dulu, lalu config file) sekali saat pertama diakses lalu di-cache
+    @cached_property
+    def _neo4j_driver_kwargs(self):
         # Try environment variables first (for deployment), fallback to config file
         neo4j_uri = os.getenv("NEO4J_URI")
         neo4j_username = os.getenv("NEO4J_USERNAME")
@@ -24,7 +27,8 @@ class Config:
             "auth": (neo4j_data["username"], neo4j_data["password"])
         }
     
-    def get_neo4j_database_name(self):
+    @cached_property
+    def _neo4j_database_name(self):
         # Try environment variable first
         database_name = os.getenv("NEO4J_DATABASE")
         if database_name:
@@ -34,7 +38,8 @@ class Config:
         neo4j_data = self._data["neo4j"]
         return neo4j_data["database_name"]
     
-    def get_gemini_api_key(self):
+    @cached_property
+    def _gemini_api_key(self):
         # Try environment variable first
         api_key = os.getenv("GEMINI_API_KEY")
         if api_key:
@@ -43,7 +48,45 @@ class Config:
         # Fallback to config file
         gemini_data = self._data.get("gemini", {})
         return gemini_data.get("api_key")
+    
+    @cached_property
+    def _gemini_model_name(self):
+        # Try environment variable first
+        model_name = os.getenv("GEMINI_MODEL")
+        if model_name:
+            return model_name
+        
+        # Fallback to config file (default gemini-2.5-flash)
+        gemini_data = self._data.get("gemini", {})
+        return gemini_data.get("model", "gemini-2.5-flash")
+    
+    @cached_property
+    def _admin_token(self):
+        # Try environment variable first
+        admin_token = os.getenv("ADMIN_TOKEN")
+        if admin_token:
+            return admin_token
+        
+        # Fallback to config file
+        admin_data = self._data.get("admin", {})
+        return admin_data.get("token")
+    
+    def get_neo4j_driver_kwargs(self):
+        return self._neo4j_driver_kwargs
+    
+    def get_neo4j_database_name(self):
+        return self._neo4j_database_name
+    
+    def get_gemini_api_key(self):
+        return self._gemini_api_key
+    
+    def get_gemini_model_name(self):
+        return self._gemini_model_name
+    
+    def get_admin_token(self):
+        return self._admin_token
 
+@lru_cache()
 def load_config(toml_path: str = "config.toml"):
     # Allow running without config file if all env vars are set
     if not os.path.exists(toml_path):
@@ -51,4 +94,3 @@ def load_config(toml_path: str = "config.toml"):
     
     with open(toml_path, mode="rb") as fp:
         return Config(tomllib.load(fp))
-
@@ -1,5 +1,6 @@
 from config import load_config
 from neo4j import GraphDatabase as Neo4jDatabase
+from neo4j import AsyncGraphDatabase as AsyncNeo4jDatabase
 
 class GraphDatabaseDriver:
     def __init__(self, toml_config_path: str = "config.toml"):
@@ -26,6 +27,31 @@ class GraphDatabaseDriver:
     def get_last_result_details(self):
         return self._last_result_details.to_eager_result()
 
+class AsyncGraphDatabaseDriver:
+    def __init__(self, toml_config_path: str = "config.toml", max_connection_pool_size: int = 50):
+        self._config = load_config(toml_config_path)
+        self._max_connection_pool_size = max_connection_pool_size
+        self._driver = None
+
+    async def __aenter__(self):
+        kwargs = self._config.get_neo4j_driver_kwargs()
+        self._driver = AsyncNeo4jDatabase.driver(
+            **kwargs,
+            max_connection_pool_size=self._max_connection_pool_size
+        )
+        await self._driver.verify_connectivity()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self._driver:
+            await self._driver.close()
+
+    async def execute_query(self, query: str, **params):
+        database_name = self._config.get_neo4j_database_name()
+        async with self._driver.session(database=database_name) as session:
+            result = await session.run(query, params)
+            return await result.data()
+
 if __name__ == "__main__":
     with GraphDatabaseDriver() as driver:
         results = driver.execute_query("""
@@ -0,0 +1,77 @@
+"""
+Kernel scoring DraftSystem yang di-compile dengan Numba (opsional)
+Dipisah dari draft_system.py agar file cache Numba tetap valid antar import
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+if HAS_NUMBA:
+    @njit(cache=True, fastmath=True)
+    def score_all(role_arr, lane_arr, dmg_arr, flex_arr, counter_mat, compatible_mat,
+                  cand_idx, enemy_idx, team_idx, new_role_mask, role_bonus, missing_lane_mask,
+                  user_lane_bit, jr_role_bits, missing_dmg_mask):
+        """Priority hero kandidat (cand_idx), sama dengan DraftSystem.score_all versi NumPy"""
+        n = cand_idx.shape[0]
+        priority = np.empty(n, dtype=np.float64)
+
+        for k in range(n):
+            i = cand_idx[k]
+            p = 10.0
+
+            # Counter pick
+            for j in enemy_idx:
+                if counter_mat[i, j]:
+                    p += 20
+                    break
+
+            # Lane yang dibutuhkan
+            needed = lane_arr[i] & missing_lane_mask
+            if needed & user_lane_bit:
+                p += 25
+            elif needed:
+                p += 20
+
+            # Role diversity
+            if role_arr[i] & new_role_mask:
+                p += role_bonus
+
+            # Jungle-roam
+            if role_arr[i] & jr_role_bits:
+                p += 15
+
+            # Synergy
+            for j in team_idx:
+                if compatible_mat[i, j]:
+                    p += 10
+                    break
+
+            # Damage balance
+            if dmg_arr[i] & missing_dmg_mask:
+                p += 8
+
+            # Fleksibilitas
+            p += flex_arr[i] * 2
+
+            priority[k] = p
+
+        return priority
+else:
+    score_all = None
+
+
+def warm_up():
+    """Compile (atau load dari cache) kernel dengan input kecil"""
+    if not HAS_NUMBA:
+        return
+    mask = np.zeros(1, dtype=np.uint8)
+    mat = np.zeros((1, 1), dtype=bool)
+    idx = np.zeros(1, dtype=np.intp)
+    score_all(mask, mask, mask, np.zeros(1, dtype=np.int8), mat, mat,
+              idx, idx, idx, 0, 0, 0, 0, 0, 0)
@@ -3,10 +3,18 @@ SISTEM REKOMENDASI DRAFT PICK MOBILE LEGENDS
 Versi Python dari draft_system.pl
 """
 
-from typing import List, Dict, Tuple, Optional, Set
+from typing import List, Dict, Tuple, Optional, Set, FrozenSet, Iterable, Union
+from collections import Counter
 from dataclasses import dataclass
 from enum import Enum
 import os
+import pickle
+import random
+import re
+
+import numpy as np
+
+import draft_kernels
 
 
 class Lane(str, Enum):
@@ -32,6 +40,21 @@ class DamageType(str, Enum):
     TRUE = "true"
 
 
+# Bit index per role/lane/damage type, agar cek keanggotaan cukup dengan operasi AND/OR integer
+ROLE_BITS = {r.value: 1 << i for i, r in enumerate(Role)}
+LANE_BITS = {l.value: 1 << i for i, l in enumerate(Lane)}
+DAMAGE_BITS = {d.value: 1 << i for i, d in enumerate(DamageType)}
+ALL_LANES_MASK = sum(LANE_BITS.values())
+ALL_ROLES_MASK = sum(ROLE_BITS.values())
+
+# Anggota tim: "hero", "hero-lane", atau pasangan (hero, lane) hasil _normalize_team
+TeamPair = Tuple[str, Optional[str]]
+Team = List[Union[str, TeamPair]]
+
+# Satu fakta prolog per baris, contoh: memiliki_role(hero, role).
+_FACT_RE = re.compile(r'^\s*(\w+)\(([^)]*)\)\.\s*$', re.M)
+
+
 @dataclass
 class HeroRecommendation:
     hero: str
@@ -50,6 +73,21 @@ class TeamAnalysis:
     lane_validation: Dict
 
 
+@dataclass
+class TeamContext:
+    """State agregat tim yang dihitung sekali per rekomendasi"""
+    enemy_heroes: List[str]
+    team_heroes: List[str]
+    user_lane: str
+    team_role_mask: int
+    team_damage_mask: int
+    role_diversity: int
+    missing_lanes_mask: int
+    user_lane_filled: bool
+    jungle_hero: Optional[str]
+    roam_hero: Optional[str]
+
+
 @dataclass
 class DraftResult:
     recommendations: List[HeroRecommendation]
@@ -62,275 +100,375 @@ class DraftSystem:
     
     def __init__(self):
         self.heroes: Set[str] = set()
-        self.hero_roles: Dict[str, List[str]] = {}
-        self.hero_lanes: Dict[str, List[str]] = {}
-        self.hero_damage_types: Dict[str, List[str]] = {}
+        # Urutan sesuai file facts, dibekukan jadi tuple setelah load
+        self.hero_roles: Dict[str, Tuple[str, ...]] = {}
+        self.hero_lanes: Dict[str, Tuple[str, ...]] = {}
+        self.hero_damage_types: Dict[str, Tuple[str, ...]] = {}
         self.counters: List[Tuple[str, str]] = []  # (hero1, hero2) = hero1 counter hero2
         self.compatible: List[Tuple[str, str]] = []  # (hero1, hero2) = compatible
         
+        # Adjacency untuk lookup O(1) tanpa scan list counters/compatible
+        self.counters_by_attacker: Dict[str, FrozenSet[str]] = {}  # hero -> hero yang di-counter
+        self.counters_by_target: Dict[str, Tuple[str, ...]] = {}  # hero -> counter-nya (urutan file)
+        self.compatible_with: Dict[str, FrozenSet[str]] = {}  # simetris
+        
+        # Jumlah fakta iscounter(hero, _) per hero, termasuk fakta duplikat (filter first pick)
+        self.counter_count_of: Dict[str, int] = Counter()
+        
+        # Bitmask role/lane/damage type per hero (lihat ROLE_BITS, LANE_BITS, DAMAGE_BITS)
+        self.hero_role_mask: Dict[str, int] = {}
+        self.hero_lane_mask: Dict[str, int] = {}
+        self.hero_damage_mask: Dict[str, int] = {}
+        
         self._load_data()
+        self._build_arrays()
+        
+        # Compile kernel Numba sekarang, bukan saat request pertama
+        draft_kernels.warm_up()
+    
+    # Versi format cache, naikkan jika struktur atribut berubah
+    _CACHE_VERSION = 3
+    
+    # Atribut hasil parsing yang disimpan di cache pickle
+    _CACHED_ATTRS = (
+        "heroes", "hero_roles", "hero_lanes", "hero_damage_types",
+        "counters", "compatible",
+        "hero_role_mask", "hero_lane_mask", "hero_damage_mask",
+        "counters_by_attacker", "counters_by_target", "compatible_with",
+        "counter_count_of",
+    )
     
     def _load_data(self):
-        """Load data dari file prolog facts"""
+        """Load data dari file prolog facts (pakai cache pickle jika file tidak berubah)"""
         prolog_dir = "prolog_facts"
+        fact_files = [
+            os.path.join(prolog_dir, name)
+            for name in ("hero.pl", "role.pl", "lane.pl", "damage_type.pl", "counter.pl", "compatible.pl")
+        ]
+        cache_path = os.path.join(prolog_dir, ".cache.pkl")
+        
+        # Key cache: (path, mtime, size) semua file facts
+        cache_key = [self._CACHE_VERSION]
+        for path in fact_files:
+            st = os.stat(path)
+            cache_key.append((path, st.st_mtime_ns, st.st_size))
+        
+        if self._load_cache(cache_path, cache_key):
+            return
+        
+        self._load_all(fact_files)
+        self._freeze()
+        
+        self._save_cache(cache_path, cache_key)
+    
+    def _load_cache(self, cache_path: str, cache_key: List) -> bool:
+        """Isi atribut dari cache pickle, return False jika cache tidak ada/basi"""
+        try:
+            with open(cache_path, 'rb') as f:
+                cached = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            return False
         
-        # Load heroes
-        self._load_heroes(os.path.join(prolog_dir, "hero.pl"))
+        if not isinstance(cached, dict) or cached.get("key") != cache_key:
+            return False
         
-        # Load roles
-        self._load_roles(os.path.join(prolog_dir, "role.pl"))
+        data = cached.get("data", {})
+        if any(attr not in data for attr in self._CACHED_ATTRS):
+            return False
         
-        # Load lanes
-        self._load_lanes(os.path.join(prolog_dir, "lane.pl"))
+        for attr in self._CACHED_ATTRS:
+            setattr(self, attr, data[attr])
+        return True
+    
+    def _save_cache(self, cache_path: str, cache_key: List):
+        """Simpan hasil parsing ke cache pickle (diabaikan jika direktori read-only)"""
+        payload = {
+            "key": cache_key,
+            "data": {attr: getattr(self, attr) for attr in self._CACHED_ATTRS},
+        }
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+    
+    def _load_all(self, fact_files: List[str]):
+        """Parse semua file facts dengan satu regex per file, dispatch per predikat"""
+        # predikat -> (arity, handler)
+        handlers = {
+            "hero": (1, self._add_hero),
+            "memiliki_role": (2, self._add_role),
+            "memiliki_lane": (2, self._add_lane),
+            "memiliki_damage_type": (2, self._add_damage_type),
+            "iscounter": (2, self._add_counter),
+            "compatible": (2, self._add_compatible),
+        }
         
-        # Load damage types
-        self._load_damage_types(os.path.join(prolog_dir, "damage_type.pl"))
+        for filepath in fact_files:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                text = f.read()
+            
+            for predicate, args_str in _FACT_RE.findall(text):
+                handler = handlers.get(predicate)
+                if handler is None:
+                    continue
+                arity, add = handler
+                args = [arg.strip() for arg in args_str.split(",")]
+                if len(args) == arity:
+                    add(*args)
+    
+    def _freeze(self):
+        """Bekukan value hasil parsing: tuple untuk list berurutan, frozenset untuk adjacency"""
+        for attr in ("hero_roles", "hero_lanes", "hero_damage_types", "counters_by_target"):
+            setattr(self, attr, {k: tuple(v) for k, v in getattr(self, attr).items()})
+        for attr in ("counters_by_attacker", "compatible_with"):
+            setattr(self, attr, {k: frozenset(v) for k, v in getattr(self, attr).items()})
+        self.counter_count_of = dict(self.counter_count_of)
+    
+    def _add_hero(self, hero: str):
+        self.heroes.add(hero)
+    
+    def _add_role(self, hero: str, role: str):
+        self.hero_roles.setdefault(hero, []).append(role)
+        self.hero_role_mask[hero] = self.hero_role_mask.get(hero, 0) | ROLE_BITS.get(role, 0)
+    
+    def _add_lane(self, hero: str, lane: str):
+        self.hero_lanes.setdefault(hero, []).append(lane)
+        self.hero_lane_mask[hero] = self.hero_lane_mask.get(hero, 0) | LANE_BITS.get(lane, 0)
+    
+    def _add_damage_type(self, hero: str, damage_type: str):
+        self.hero_damage_types.setdefault(hero, []).append(damage_type)
+        self.hero_damage_mask[hero] = self.hero_damage_mask.get(hero, 0) | DAMAGE_BITS.get(damage_type, 0)
+    
+    def _add_counter(self, counter: str, target: str):
+        self.counters.append((counter, target))
+        self.counters_by_attacker.setdefault(counter, set()).add(target)
+        self.counters_by_target.setdefault(target, []).append(counter)
+        self.counter_count_of[counter] += 1
+    
+    def _add_compatible(self, hero1: str, hero2: str):
+        self.compatible.append((hero1, hero2))
+        self.compatible_with.setdefault(hero1, set()).add(hero2)
+        self.compatible_with.setdefault(hero2, set()).add(hero1)
+    
+    def _build_arrays(self):
+        """Tabel NumPy per hero (diindeks hero_id) untuk scoring vektorisasi"""
+        names = set(self.heroes)
+        names.update(self.hero_roles, self.hero_lanes, self.hero_damage_types)
+        names.update(self.counters_by_attacker, self.counters_by_target, self.compatible_with)
+        
+        # Urut alfabet agar ranking dengan priority sama tetap deterministik
+        self.hero_name: List[str] = sorted(names)
+        self.hero_id: Dict[str, int] = {hero: i for i, hero in enumerate(self.hero_name)}
+        n = len(self.hero_name)
+        
+        self.role_mask_arr = np.array([self.hero_role_mask.get(h, 0) for h in self.hero_name], dtype=np.uint8)
+        self.lane_mask_arr = np.array([self.hero_lane_mask.get(h, 0) for h in self.hero_name], dtype=np.uint8)
+        self.dmg_mask_arr = np.array([self.hero_damage_mask.get(h, 0) for h in self.hero_name], dtype=np.uint8)
+        self.flex_arr = np.array([self.flexibility_score(h) for h in self.hero_name], dtype=np.int8)
+        self.is_hero_arr = np.array([h in self.heroes for h in self.hero_name], dtype=bool)
+        
+        # Relasi sebagai pasangan ID integer (urutan file, termasuk fakta duplikat)
+        counter_ids = np.array([(self.hero_id[c], self.hero_id[t]) for c, t in self.counters], dtype=np.int32).reshape(-1, 2)
+        compatible_ids = np.array([(self.hero_id[a], self.hero_id[b]) for a, b in self.compatible], dtype=np.int32).reshape(-1, 2)
+        
+        # counter_of[i, j] = hero i counter hero j; compatible_of simetris
+        self.counter_of = np.zeros((n, n), dtype=bool)
+        self.counter_of[counter_ids[:, 0], counter_ids[:, 1]] = True
+        self.compatible_of = np.zeros((n, n), dtype=bool)
+        self.compatible_of[compatible_ids[:, 0], compatible_ids[:, 1]] = True
+        self.compatible_of[compatible_ids[:, 1], compatible_ids[:, 0]] = True
+        
+        # ID hero (yang ada di hero.pl) per lane, untuk prefilter kandidat sebelum scoring
+        self.heroes_by_lane: Dict[str, np.ndarray] = {
+            lane: np.flatnonzero(self.is_hero_arr & ((self.lane_mask_arr & bit) != 0))
+            for lane, bit in LANE_BITS.items()
+        }
         
-        # Load counters
-        self._load_counters(os.path.join(prolog_dir, "counter.pl"))
+        # Vektor 0/1 per role/lane/damage type (urutan enum) untuk update count tim secara inkremental
+        self.role_vector_arr = ((self.role_mask_arr[:, None] >> np.arange(len(Role))) & 1).astype(np.int8)
+        self.damage_vector_arr = ((self.dmg_mask_arr[:, None] >> np.arange(len(DamageType))) & 1).astype(np.int8)
         
-        # Load compatible
-        self._load_compatible(os.path.join(prolog_dir, "compatible.pl"))
+        # Versi array dari counter_count_of (dipakai filter first pick)
+        self.counter_count_arr = np.array([self.counter_count_of.get(h, 0) for h in self.hero_name], dtype=np.int16)
     
-    def _parse_prolog_fact(self, line: str, predicate: str) -> Optional[List[str]]:
-        """Parse fakta prolog seperti: memiliki_role(hero, role)."""
-        line = line.strip()
-        if line.startswith(predicate + "(") and line.endswith(")."):
-            # Extract arguments
-            content = line[len(predicate)+1:-2]
-            args = [arg.strip() for arg in content.split(",")]
-            return args
-        return None
+    def _indices(self, heroes: Iterable[str]) -> np.ndarray:
+        """ID hero yang dikenal (nama tak dikenal diabaikan)"""
+        return np.array([self.hero_id[h] for h in heroes if h in self.hero_id], dtype=np.intp)
     
-    def _load_heroes(self, filepath: str):
-        """Load daftar hero"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                args = self._parse_prolog_fact(line, "hero")
-                if args and len(args) == 1:
-                    self.heroes.add(args[0])
-    
-    def _load_roles(self, filepath: str):
-        """Load role setiap hero"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                args = self._parse_prolog_fact(line, "memiliki_role")
-                if args and len(args) == 2:
-                    hero, role = args
-                    if hero not in self.hero_roles:
-                        self.hero_roles[hero] = []
-                    self.hero_roles[hero].append(role)
-    
-    def _load_lanes(self, filepath: str):
-        """Load lane setiap hero"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                args = self._parse_prolog_fact(line, "memiliki_lane")
-                if args and len(args) == 2:
-                    hero, lane = args
-                    if hero not in self.hero_lanes:
-                        self.hero_lanes[hero] = []
-                    self.hero_lanes[hero].append(lane)
-    
-    def _load_damage_types(self, filepath: str):
-        """Load damage type setiap hero"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                args = self._parse_prolog_fact(line, "memiliki_damage_type")
-                if args and len(args) == 2:
-                    hero, damage_type = args
-                    if hero not in self.hero_damage_types:
-                        self.hero_damage_types[hero] = []
-                    self.hero_damage_types[hero].append(damage_type)
-    
-    def _load_counters(self, filepath: str):
-        """Load counter relationships"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                args = self._parse_prolog_fact(line, "iscounter")
-                if args and len(args) == 2:
-                    self.counters.append((args[0], args[1]))
-    
-    def _load_compatible(self, filepath: str):
-        """Load compatible relationships"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                args = self._parse_prolog_fact(line, "compatible")
-                if args and len(args) == 2:
-                    self.compatible.append((args[0], args[1]))
+    def _lane_candidates(self, user_lane: str, taken: Set[str]) -> np.ndarray:
+        """ID hero yang bisa main di user_lane dan belum dibanned/dipick (urut alfabetis)"""
+        candidates = self.heroes_by_lane.get(user_lane)
+        if candidates is None:
+            return np.empty(0, dtype=np.intp)
+        
+        taken_idx = self._indices(taken)
+        if taken_idx.size:
+            available = np.ones(len(self.hero_name), dtype=bool)
+            available[taken_idx] = False
+            candidates = candidates[available[candidates]]
+        return candidates
     
     # ===== UTILITY METHODS =====
     
     def extract_hero(self, hero_lane: str) -> str:
         """Extract hero dari format hero-lane"""
-        if "-" in hero_lane:
-            return hero_lane.split("-")[0]
-        return hero_lane
+        return hero_lane.partition("-")[0]
     
     def extract_lane(self, hero_lane: str) -> Optional[str]:
         """Extract lane dari format hero-lane"""
-        if "-" in hero_lane:
-            return hero_lane.split("-")[1]
-        return None
+        _, sep, lane = hero_lane.partition("-")
+        return lane if sep else None
     
-    def extract_all_heroes(self, team: List[str]) -> List[str]:
+    def extract_all_heroes(self, team: Team) -> List[str]:
         """Extract semua hero dari list (dengan atau tanpa lane specification)"""
-        return [self.extract_hero(hl) for hl in team]
+        return [hero for hero, _ in self._normalize_team(team)]
+    
+    def _normalize_pick(self, hero_lane: Union[str, TeamPair]) -> TeamPair:
+        if isinstance(hero_lane, tuple):
+            return hero_lane
+        hero, sep, lane = hero_lane.partition("-")
+        return hero, (lane if sep else None)
     
-    def hero_tersedia(self, hero: str, banned: List[str], enemy: List[str], team: List[str]) -> bool:
+    def _normalize_team(self, team: Team) -> List[TeamPair]:
+        """Normalisasi tim ke list (hero, lane), lane None jika tidak dispesifikasi"""
+        # Entry yang sudah berupa pasangan dibiarkan, jadi helper menerima tim mentah maupun ternormalisasi
+        return [self._normalize_pick(hero_lane) for hero_lane in team]
+    
+    def hero_tersedia(self, hero: str, banned: List[str], enemy: List[str], team: Team) -> bool:
         """Cek apakah hero tidak dibanned dan tidak dipick"""
-        if hero not in self.heroes:
-            return False
-        if hero in banned:
-            return False
-        if hero in enemy:
-            return False
-        team_heroes = self.extract_all_heroes(team)
-        if hero in team_heroes:
-            return False
-        return True
+        return self._hero_tersedia_fast(hero, self._taken_set(banned, enemy, team))
+    
+    def _taken_set(self, banned: List[str], enemy: List[str], team: Team) -> Set[str]:
+        """Gabungan hero yang dibanned/dipick, dihitung sekali per rekomendasi"""
+        taken = set(banned)
+        taken.update(enemy)
+        taken.update(self.extract_all_heroes(team))
+        return taken
+    
+    def _hero_tersedia_fast(self, hero: str, taken: Set[str]) -> bool:
+        """hero_tersedia dengan set hero terpakai yang sudah dihitung (lihat _taken_set)"""
+        return hero in self.heroes and hero not in taken
     
     def memiliki_role(self, hero: str, role: str) -> bool:
         """Cek apakah hero memiliki role tertentu"""
-        return hero in self.hero_roles and role in self.hero_roles[hero]
+        return (self.hero_role_mask.get(hero, 0) & ROLE_BITS.get(role, 0)) != 0
     
     def memiliki_lane(self, hero: str, lane: str) -> bool:
         """Cek apakah hero bisa main di lane tertentu"""
-        return hero in self.hero_lanes and lane in self.hero_lanes[hero]
+        return (self.hero_lane_mask.get(hero, 0) & LANE_BITS.get(lane, 0)) != 0
     
     def memiliki_damage_type(self, hero: str, damage_type: str) -> bool:
         """Cek apakah hero memiliki damage type tertentu"""
-        return hero in self.hero_damage_types and damage_type in self.hero_damage_types[hero]
+        return (self.hero_damage_mask.get(hero, 0) & DAMAGE_BITS.get(damage_type, 0)) != 0
     
-    def count_role_in_team(self, role: str, team: List[str]) -> int:
+    def team_role_mask(self, team: Team) -> int:
+        """Gabungan (OR) bitmask role semua hero dalam tim"""
+        return self._heroes_role_mask(self.extract_all_heroes(team))
+    
+    def team_damage_mask(self, team: Team) -> int:
+        """Gabungan (OR) bitmask damage type semua hero dalam tim"""
+        return self._heroes_damage_mask(self.extract_all_heroes(team))
+    
+    def _heroes_role_mask(self, team_heroes: List[str]) -> int:
+        mask = 0
+        for hero in team_heroes:
+            mask |= self.hero_role_mask.get(hero, 0)
+        return mask
+    
+    def _heroes_damage_mask(self, team_heroes: List[str]) -> int:
+        mask = 0
+        for hero in team_heroes:
+            mask |= self.hero_damage_mask.get(hero, 0)
+        return mask
+    
+    def count_role_in_team(self, role: str, team: Team) -> int:
         """Hitung jumlah hero per role dalam tim"""
-        count = 0
-        for hero_lane in team:
-            hero = self.extract_hero(hero_lane)
-            if self.memiliki_role(hero, role):
-                count += 1
-        return count
-    
-    def count_specified_lane_in_team(self, lane: str, team: List[str]) -> int:
+        return sum(1 for hero in self.extract_all_heroes(team) if self.memiliki_role(hero, role))
+    
+    def count_specified_lane_in_team(self, lane: str, team: Team) -> int:
         """Hitung hero dengan spesifikasi lane yang jelas"""
-        count = 0
-        for hero_lane in team:
-            if "-" in hero_lane:
-                _, hero_lane_spec = hero_lane.split("-", 1)
-                if hero_lane_spec == lane:
-                    count += 1
-        return count
-    
-    def lane_terpenuhi(self, lane: str, team: List[str]) -> bool:
+        return sum(1 for _, hero_lane in self._normalize_team(team) if hero_lane == lane)
+    
+    def lane_terpenuhi(self, lane: str, team: Team) -> bool:
         """Cek apakah lane sudah terpenuhi dalam tim"""
         return self.count_specified_lane_in_team(lane, team) > 0
     
-    def lane_dibutuhkan(self, lane: str, team: List[str]) -> bool:
+    def lane_dibutuhkan(self, lane: str, team: Team) -> bool:
         """Cek apakah tim kekurangan lane tertentu"""
         return not self.lane_terpenuhi(lane, team)
     
-    def count_unique_roles(self, team: List[str]) -> int:
+    def count_unique_roles(self, team: Team) -> int:
         """Hitung jumlah role yang berbeda dalam tim"""
-        roles = set()
-        for hero_lane in team:
-            hero = self.extract_hero(hero_lane)
-            if hero in self.hero_roles:
-                for role in self.hero_roles[hero]:
-                    roles.add(role)
-        return len(roles)
-    
-    def adds_role_diversity(self, hero: str, team: List[str]) -> bool:
+        return self.team_role_mask(team).bit_count()
+    
+    def adds_role_diversity(self, hero: str, team: Team) -> bool:
         """Cek apakah hero menambah diversity role ke tim"""
-        if hero not in self.hero_roles:
-            return False
-        
-        hero_roles = self.hero_roles[hero]
-        team_roles = set()
-        for hero_lane in team:
-            h = self.extract_hero(hero_lane)
-            if h in self.hero_roles:
-                team_roles.update(self.hero_roles[h])
-        
         # Cek apakah ada role baru
-        for role in hero_roles:
-            if role not in team_roles:
-                return True
-        return False
+        return (self.hero_role_mask.get(hero, 0) & ~self.team_role_mask(team)) != 0
     
-    def would_duplicate_lane(self, hero: str, team: List[str], user_lane: str) -> bool:
+    def would_duplicate_lane(self, hero: str, team: Team, user_lane: str) -> bool:
         """Cek apakah hero akan menyebabkan duplikasi lane"""
         if not self.memiliki_lane(hero, user_lane):
             return False
         
         # Cek apakah ada hero yang sudah assigned ke lane ini
-        for hero_lane in team:
-            if "-" in hero_lane:
-                _, lane = hero_lane.split("-", 1)
-                if lane == user_lane:
-                    return True
-        return False
+        return self.lane_terpenuhi(user_lane, team)
     
-    def valid_lane_addition(self, hero: str, team: List[str], user_lane: str) -> bool:
+    def valid_lane_addition(self, hero: str, team: Team, user_lane: str) -> bool:
         """Cek apakah penambahan hero valid (tidak duplikasi lane)"""
         return not self.would_duplicate_lane(hero, team, user_lane)
     
     def flexibility_score(self, hero: str) -> int:
         """Hitung skor fleksibilitas hero (berdasarkan jumlah role dan lane)"""
-        role_count = len(self.hero_roles.get(hero, []))
-        lane_count = len(self.hero_lanes.get(hero, []))
+        role_count = len(self.hero_roles.get(hero, ()))
+        lane_count = len(self.hero_lanes.get(hero, ()))
         return role_count + lane_count
     
     def is_counter_pick(self, hero: str, enemy_heroes: List[str]) -> bool:
         """Cek apakah hero adalah counter untuk musuh"""
-        for enemy in enemy_heroes:
-            if (hero, enemy) in self.counters:
-                return True
-        return False
+        countered = self.counters_by_attacker.get(hero)
+        if not countered:
+            return False
+        return any(enemy in countered for enemy in enemy_heroes)
     
-    def good_synergy_with_team(self, hero: str, team: List[str]) -> bool:
+    def good_synergy_with_team(self, hero: str, team: Team) -> bool:
         """Cek kompatibilitas dengan tim"""
         if not team:
             return False
         
-        for hero_lane in team:
-            teammate = self.extract_hero(hero_lane)
-            if (hero, teammate) in self.compatible or (teammate, hero) in self.compatible:
-                return True
-        return False
+        partners = self.compatible_with.get(hero)
+        if not partners:
+            return False
+        return any(teammate in partners for teammate in self.extract_all_heroes(team))
     
-    def has_damage_balance(self, team: List[str]) -> bool:
+    def has_damage_balance(self, team: Team) -> bool:
         """Cek keseimbangan damage type"""
         if len(team) <= 1:
             return True
         
-        has_physical = False
-        has_magic = False
-        
-        for hero_lane in team:
-            hero = self.extract_hero(hero_lane)
-            if self.memiliki_damage_type(hero, "physical"):
-                has_physical = True
-            if self.memiliki_damage_type(hero, "magic"):
-                has_magic = True
-        
-        return has_physical and has_magic
+        team_mask = self.team_damage_mask(team)
+        return (team_mask & DAMAGE_BITS["physical"]) != 0 and (team_mask & DAMAGE_BITS["magic"]) != 0
     
-    def get_jungle_hero(self, team: List[str]) -> Optional[str]:
+    def get_jungle_hero(self, team: Team) -> Optional[str]:
         """Cek hero jungle dalam tim"""
-        for hero_lane in team:
-            if "-" in hero_lane:
-                hero, lane = hero_lane.split("-", 1)
-                if lane == "jungle":
-                    return hero
-        return None
+        return self._hero_in_lane(self._normalize_team(team), "jungle")
     
-    def get_roam_hero(self, team: List[str]) -> Optional[str]:
+    def get_roam_hero(self, team: Team) -> Optional[str]:
         """Cek hero roam dalam tim"""
-        for hero_lane in team:
-            if "-" in hero_lane:
-                hero, lane = hero_lane.split("-", 1)
-                if lane == "roam":
-                    return hero
+        return self._hero_in_lane(self._normalize_team(team), "roam")
+    
+    @staticmethod
+    def _hero_in_lane(team_pairs: List[TeamPair], lane: str) -> Optional[str]:
+        """Hero pertama yang di-assign ke lane tertentu"""
+        for hero, hero_lane in team_pairs:
+            if hero_lane == lane:
+                return hero
         return None
     
     def recommended_roam_role_for_jungle(self, jungle_hero: str) -> str:
@@ -341,7 +479,7 @@ class DraftSystem:
             return "support"
         return "tank"  # default
     
-    def valid_jungle_roam_combination(self, team: List[str]) -> bool:
+    def valid_jungle_roam_combination(self, team: Team) -> bool:
         """Cek apakah jungle-roam combination valid"""
         jungle_hero = self.get_jungle_hero(team)
         roam_hero = self.get_roam_hero(team)
@@ -363,232 +501,207 @@ class DraftSystem:
     
     # ===== PRIORITY CALCULATION =====
     
-    def calculate_priority(self, hero: str, enemy_heroes: List[str], team_heroes: List[str], user_lane: str) -> Tuple[float, List[str]]:
+    def build_team_context(self, enemy_heroes: List[str], team: Team, user_lane: str) -> TeamContext:
+        """Hitung state agregat tim sekali untuk dipakai semua kandidat hero"""
+        team_pairs = self._normalize_team(team)
+        team_heroes = [hero for hero, _ in team_pairs]
+        
+        # Lane yang belum punya hero dengan spesifikasi lane
+        filled_lanes_mask = 0
+        for _, lane in team_pairs:
+            if lane is not None:
+                filled_lanes_mask |= LANE_BITS.get(lane, 0)
+        
+        team_role_mask = self._heroes_role_mask(team_heroes)
+        return TeamContext(
+            enemy_heroes=enemy_heroes,
+            team_heroes=team_heroes,
+            user_lane=user_lane,
+            team_role_mask=team_role_mask,
+            team_damage_mask=self._heroes_damage_mask(team_heroes),
+            role_diversity=team_role_mask.bit_count(),
+            missing_lanes_mask=ALL_LANES_MASK & ~filled_lanes_mask,
+            user_lane_filled=(filled_lanes_mask & LANE_BITS.get(user_lane, 0)) != 0,
+            jungle_hero=self._hero_in_lane(team_pairs, "jungle"),
+            roam_hero=self._hero_in_lane(team_pairs, "roam")
+        )
+    
+    def calculate_priority(self, hero: str, ctx: TeamContext) -> Tuple[float, List[str]]:
         """Kalkulasi prioritas hero berdasarkan berbagai faktor"""
-        reasons = []
-        
-        # Base priority
-        priority = 10.0
-        
-        # Bonus untuk counter pick
-        if self.is_counter_pick(hero, enemy_heroes):
-            priority += 20
-            reasons.append("Counter pick terhadap musuh")
+        hero_id = self.hero_id.get(hero)
+        if hero_id is None:
+            # Hero tanpa fakta apa pun: hanya base priority
+            return 10.0, ["Hero fleksibel (+0)"]
         
-        # Bonus untuk lane yang dibutuhkan tim (prioritas utama)
-        lane_bonus = self._check_needed_lane_bonus(hero, team_heroes, user_lane)
-        if lane_bonus > 0:
-            priority += lane_bonus
-            reasons.append(f"Mengisi lane yang dibutuhkan (+{lane_bonus})")
-        
-        # Bonus untuk role diversity
-        role_bonus = self._check_role_diversity_bonus(hero, team_heroes)
-        if role_bonus > 0:
-            priority += role_bonus
-            reasons.append(f"Menambah variasi role (+{role_bonus})")
-        
-        # Bonus untuk jungle-roam combination rules
-        jr_bonus = self._check_jungle_roam_bonus(hero, team_heroes, user_lane)
-        if jr_bonus > 0:
-            priority += jr_bonus
-            reasons.append(f"Kombinasi jungle-roam yang baik (+{jr_bonus})")
-        
-        # Bonus untuk synergy dengan tim
-        if self.good_synergy_with_team(hero, team_heroes):
-            priority += 10
-            reasons.append("Synergy baik dengan tim (+10)")
-        
-        # Bonus untuk keseimbangan damage
-        damage_bonus = self._check_damage_balance_bonus(hero, team_heroes)
-        if damage_bonus > 0:
-            priority += damage_bonus
-            reasons.append(f"Menyeimbangkan damage type (+{damage_bonus})")
-        
-        # Bonus fleksibilitas
-        flex_score = self.flexibility_score(hero)
-        flex_bonus = flex_score * 2
-        priority += flex_bonus
-        reasons.append(f"Hero fleksibel (+{flex_bonus})")
+        components = self.score_components(ctx, np.array([hero_id], dtype=np.intp))
+        priority, reasons = self._priority_with_reasons(components, 0)
         
         # Penalti untuk duplikasi lane (safety check)
-        if self.would_duplicate_lane(hero, team_heroes, user_lane):
+        if ctx.user_lane_filled and self.memiliki_lane(hero, ctx.user_lane):
             priority -= 50
             reasons.append("WARNING: Duplikasi lane (-50)")
         
         return priority, reasons
     
-    def _check_role_diversity_bonus(self, hero: str, team_heroes: List[str]) -> float:
-        """Helper untuk bonus role diversity"""
-        current_diversity = self.count_unique_roles(team_heroes)
-        if self.adds_role_diversity(hero, team_heroes):
-            bonus = 20 - (current_diversity * 3)
-            return max(0, bonus)
-        return 0
-    
-    def _check_needed_lane_bonus(self, hero: str, team_heroes: List[str], user_lane: str) -> float:
-        """Helper untuk bonus lane yang dibutuhkan"""
-        if self.memiliki_lane(hero, user_lane) and self.lane_dibutuhkan(user_lane, team_heroes):
-            return 25
-        
-        # Cek lane lain yang dibutuhkan
-        for lane in ["gold", "jungle", "roam", "mid", "exp"]:
-            if self.memiliki_lane(hero, lane) and self.lane_dibutuhkan(lane, team_heroes):
-                return 20
-        
-        return 0
-    
-    def _check_jungle_roam_bonus(self, hero: str, team_heroes: List[str], user_lane: str) -> float:
-        """Helper untuk bonus jungle-roam combination"""
-        # Jika user pick roam
-        if user_lane == "roam":
-            jungle_hero = self.get_jungle_hero(team_heroes)
-            if jungle_hero:
-                recommended_role = self.recommended_roam_role_for_jungle(jungle_hero)
-                if self.memiliki_role(hero, recommended_role):
-                    return 15
-        
-        # Jika user pick jungle
-        if user_lane == "jungle":
-            roam_hero = self.get_roam_hero(team_heroes)
-            if roam_hero:
-                # Cek apakah hero jungle cocok dengan roam yang sudah ada
-                if self.memiliki_role(roam_hero, "tank") and self.memiliki_role(hero, "assassin"):
-                    return 15
-                if self.memiliki_role(roam_hero, "support") and \
-                   (self.memiliki_role(hero, "tank") or self.memiliki_role(hero, "fighter")):
-                    return 15
-        
-        return 0
-    
-    def _check_damage_balance_bonus(self, hero: str, team_heroes: List[str]) -> float:
-        """Helper untuk bonus keseimbangan damage"""
-        has_magic = False
-        has_physical = False
-        
-        for hero_lane in team_heroes:
-            h = self.extract_hero(hero_lane)
-            if self.memiliki_damage_type(h, "magic"):
-                has_magic = True
-            if self.memiliki_damage_type(h, "physical"):
-                has_physical = True
-        
-        # Jika tim kekurangan magic damage dan hero adalah mage
-        if not has_magic and self.memiliki_damage_type(hero, "magic"):
-            return 8
-        
-        # Jika tim kekurangan physical damage dan hero adalah physical
-        if not has_physical and self.memiliki_damage_type(hero, "physical"):
-            return 8
-        
-        return 0
+    def _priority_with_reasons(self, components: Dict[str, np.ndarray], k: int) -> Tuple[float, List[str]]:
+        """Priority dan reasons kandidat ke-k, dari array bonus yang sama dengan score_all"""
+        counter = int(components["counter"][k])
+        lane = int(components["lane"][k])
+        role = int(components["role"][k])
+        jungle_roam = int(components["jungle_roam"][k])
+        synergy = int(components["synergy"][k])
+        damage = int(components["damage"][k])
+        flex = int(components["flex"][k])
+        
+        reasons = []
+        if counter:
+            reasons.append("Counter pick terhadap musuh")
+        if lane:
+            reasons.append(f"Mengisi lane yang dibutuhkan (+{lane})")
+        if role:
+            reasons.append(f"Menambah variasi role (+{role})")
+        if jungle_roam:
+            reasons.append(f"Kombinasi jungle-roam yang baik (+{jungle_roam})")
+        if synergy:
+            reasons.append(f"Synergy baik dengan tim (+{synergy})")
+        if damage:
+            reasons.append(f"Menyeimbangkan damage type (+{damage})")
+        reasons.append(f"Hero fleksibel (+{flex})")
+        
+        priority = 10.0 + counter + lane + role + jungle_roam + synergy + damage + flex
+        return priority, reasons
+    
+    def _jungle_roam_role_bits(self, ctx: TeamContext) -> int:
+        """Role bit yang mendapat bonus jungle-roam"""
+        if ctx.user_lane == "roam" and ctx.jungle_hero:
+            return ROLE_BITS[self.recommended_roam_role_for_jungle(ctx.jungle_hero)]
+        
+        bits = 0
+        if ctx.user_lane == "jungle" and ctx.roam_hero:
+            if self.memiliki_role(ctx.roam_hero, "tank"):
+                bits |= ROLE_BITS["assassin"]
+            if self.memiliki_role(ctx.roam_hero, "support"):
+                bits |= ROLE_BITS["tank"] | ROLE_BITS["fighter"]
+        return bits
+    
+    def _score_scalars(self, ctx: TeamContext) -> Tuple:
+        """Besaran per tim yang dipakai scoring: (enemy_idx, team_idx, new_role_mask, role_bonus,
+        user_lane_bit, jr_bits, missing_dmg)"""
+        return (
+            self._indices(ctx.enemy_heroes),
+            self._indices(ctx.team_heroes),
+            ALL_ROLES_MASK & ~ctx.team_role_mask,
+            max(0, 20 - (ctx.role_diversity * 3)),
+            LANE_BITS.get(ctx.user_lane, 0),
+            self._jungle_roam_role_bits(ctx),
+            (DAMAGE_BITS["magic"] | DAMAGE_BITS["physical"]) & ~ctx.team_damage_mask,
+        )
+    
+    def score_components(self, ctx: TeamContext, candidates: np.ndarray) -> Dict[str, np.ndarray]:
+        """Bonus per faktor (array int sejajar candidates), sumber tunggal formula priority"""
+        enemy_idx, team_idx, new_role_mask, role_bonus, user_lane_bit, jr_bits, missing_dmg = self._score_scalars(ctx)
+        role_arr = self.role_mask_arr[candidates]
+        zeros = np.zeros(len(candidates), dtype=np.int64)
+        
+        # Lane yang dibutuhkan tim (prioritas utama)
+        needed = self.lane_mask_arr[candidates] & ctx.missing_lanes_mask
+        
+        return {
+            # Counter pick
+            "counter": self.counter_of[np.ix_(candidates, enemy_idx)].any(axis=1) * 20 if enemy_idx.size else zeros,
+            "lane": np.where(needed & user_lane_bit, 25, np.where(needed != 0, 20, 0)),
+            # Role diversity
+            "role": ((role_arr & new_role_mask) != 0) * role_bonus,
+            # Jungle-roam
+            "jungle_roam": ((role_arr & jr_bits) != 0) * 15,
+            # Synergy dengan tim
+            "synergy": self.compatible_of[np.ix_(candidates, team_idx)].any(axis=1) * 10 if team_idx.size else zeros,
+            # Keseimbangan damage
+            "damage": ((self.dmg_mask_arr[candidates] & missing_dmg) != 0) * 8,
+            # Fleksibilitas
+            "flex": self.flex_arr[candidates].astype(np.int64) * 2,
+        }
+    
+    def score_all(self, ctx: TeamContext, candidates: Optional[np.ndarray] = None) -> np.ndarray:
+        """Priority hero kandidat (default semua hero) sekaligus, sama dengan calculate_priority tanpa penalti duplikasi lane"""
+        if candidates is None:
+            candidates = np.arange(len(self.hero_name), dtype=np.intp)
+        
+        if draft_kernels.HAS_NUMBA:
+            enemy_idx, team_idx, new_role_mask, role_bonus, user_lane_bit, jr_bits, missing_dmg = self._score_scalars(ctx)
+            return draft_kernels.score_all(
+                self.role_mask_arr, self.lane_mask_arr, self.dmg_mask_arr, self.flex_arr,
+                self.counter_of, self.compatible_of, candidates, enemy_idx, team_idx,
+                new_role_mask, role_bonus, ctx.missing_lanes_mask,
+                user_lane_bit, jr_bits, missing_dmg
+            )
+        
+        return 10.0 + sum(self.score_components(ctx, candidates).values())
     
     # ===== MAIN RECOMMENDATION METHODS =====
     
     def recommend_first_pick(self, banned: List[str], user_lane: str, top_n: int = 5) -> List[HeroRecommendation]:
         """Rekomendasi untuk first pick - prioritas hero fleksibel"""
-        recommendations = []
+        cand_idx = self._lane_candidates(user_lane, set(banned))
+        cand_idx = cand_idx[
+            (self.flex_arr[cand_idx] >= 3)  # Hero dengan minimal 3 poin fleksibilitas
+            & (self.counter_count_arr[cand_idx] <= 2)  # Pastikan hero memiliki sedikit counter yang diketahui
+        ]
         
-        for hero in self.heroes:
-            if not self.hero_tersedia(hero, banned, [], []):
-                continue
-            
-            if not self.memiliki_lane(hero, user_lane):
-                continue
-            
-            flex_score = self.flexibility_score(hero)
-            if flex_score < 3:  # Hero dengan minimal 3 poin fleksibilitas
-                continue
-            
-            # Pastikan hero memiliki sedikit counter yang diketahui
-            counter_count = sum(1 for c, _ in self.counters if c == hero)
-            if counter_count > 2:
-                continue
-            
+        # Sort by priority descending (stabil: nama hero alfabetis untuk priority sama)
+        order = np.argsort(-self.flex_arr[cand_idx], kind="stable")[:top_n]
+        
+        recommendations = []
+        for i in cand_idx[order]:
+            flex_score = int(self.flex_arr[i])
             recommendations.append(HeroRecommendation(
-                hero=hero,
+                hero=self.hero_name[i],
                 priority=float(flex_score),
                 reasons=[f"Hero fleksibel (score: {flex_score})"]
             ))
-        
-        # Sort by priority descending
-        recommendations.sort(key=lambda x: x.priority, reverse=True)
-        return recommendations[:top_n]
+        return recommendations
     
-    def recommend_hero(self, banned: List[str], enemy: List[str], team: List[str], 
+    def recommend_hero(self, banned: List[str], enemy: List[str], team: Team, 
                       user_lane: str, top_n: int = 5) -> List[HeroRecommendation]:
         """Rekomendasi hero berdasarkan situasi draft"""
-        recommendations = []
+        ctx = self.build_team_context(enemy, team, user_lane)
         
-        for hero in self.heroes:
-            if not self.hero_tersedia(hero, banned, enemy, team):
-                continue
-            
-            if not self.memiliki_lane(hero, user_lane):
-                continue
-            
-            if not self.valid_lane_addition(hero, team, user_lane):
-                continue
-            
-            priority, reasons = self.calculate_priority(hero, enemy, team, user_lane)
-            
+        # Semua kandidat punya user_lane, jadi duplikasi terjadi jika lane sudah terisi
+        if ctx.user_lane_filled:
+            return []
+        
+        # Hanya hero di lane user yang masuk scoring
+        cand_idx = self._lane_candidates(user_lane, self._taken_set(banned, enemy, ctx.team_heroes))
+        if not cand_idx.size:
+            return []
+        
+        priority = self.score_all(ctx, cand_idx)
+        
+        # Sort by priority descending (stabil: nama hero alfabetis untuk priority sama)
+        order = np.argsort(-priority, kind="stable")[:top_n]
+        
+        # Priority yang ditampilkan dan reasons top-N diambil dari array bonus yang sama
+        top_idx = cand_idx[order]
+        components = self.score_components(ctx, top_idx)
+        recommendations = []
+        for k, hero_id in enumerate(top_idx):
+            top_priority, reasons = self._priority_with_reasons(components, k)
             recommendations.append(HeroRecommendation(
-                hero=hero,
-                priority=priority,
+                hero=self.hero_name[hero_id],
+                priority=top_priority,
                 reasons=reasons
             ))
-        
-        # Sort by priority descending
-        recommendations.sort(key=lambda x: x.priority, reverse=True)
-        return recommendations[:top_n]
+        return recommendations
     
-    def analyze_team_composition(self, team: List[str]) -> TeamAnalysis:
+    def analyze_team_composition(self, team: Team) -> TeamAnalysis:
         """Analisis komposisi tim saat ini"""
-        # Role counts
-        role_counts = {}
-        for role in ["tank", "fighter", "assassin", "mage", "marksman", "support"]:
-            role_counts[role] = self.count_role_in_team(role, team)
-        
-        # Lane counts
-        lane_counts = {}
-        for lane in ["gold", "jungle", "roam", "mid", "exp"]:
-            lane_counts[lane] = self.count_specified_lane_in_team(lane, team)
-        
-        # Role diversity
-        role_diversity = self.count_unique_roles(team)
-        
-        # Missing lanes
-        missing_lanes = []
-        for lane in ["gold", "jungle", "roam", "mid", "exp"]:
-            if self.lane_dibutuhkan(lane, team):
-                missing_lanes.append(lane)
-        
-        # Damage balance
-        damage_balance = "balanced" if self.has_damage_balance(team) else "unbalanced"
-        
-        # Jungle-roam validation
-        jungle_roam_valid = "valid" if self.valid_jungle_roam_combination(team) else "invalid"
-        
-        # Lane validation
-        lane_validation = {
-            "valid": len(missing_lanes) == 0,
-            "missing_lanes": missing_lanes
-        }
-        
-        return TeamAnalysis(
-            role_counts=role_counts,
-            lane_counts=lane_counts,
-            role_diversity=role_diversity,
-            missing_lanes=missing_lanes,
-            damage_balance=damage_balance,
-            jungle_roam_valid=jungle_roam_valid,
-            lane_validation=lane_validation
-        )
+        return IncrementalTeamState(self, team).analysis()
     
     def analyze_enemy_threats(self, enemy_heroes: List[str]) -> List[Dict]:
         """Analisis threat dari tim musuh"""
         threats = []
         for enemy in enemy_heroes:
-            counters = [hero for hero, target in self.counters if target == enemy]
+            counters = list(self.counters_by_target.get(enemy, []))
             threats.append({
                 "enemy": enemy,
                 "counters": counters
@@ -596,8 +709,11 @@ class DraftSystem:
         return threats
     
     def get_draft_recommendation(self, banned: List[str], enemy: List[str], 
-                                team: List[str], user_lane: str) -> DraftResult:
+                                team: Team, user_lane: str) -> DraftResult:
         """Interface utama sistem draft"""
+        # Tim dinormalisasi sekali, dipakai bersama oleh rekomendasi dan analisis
+        team = self._normalize_team(team)
+        
         # Cek apakah ini first pick
         if not enemy and not team:
             recommendations = self.recommend_first_pick(banned, user_lane)
@@ -617,6 +733,102 @@ class DraftSystem:
             )
 
 
+class IncrementalTeamState:
+    """State komposisi tim yang di-update per pick (add_pick/remove_pick) tanpa scan ulang tim"""
+    
+    def __init__(self, draft: DraftSystem, team: Optional[Team] = None):
+        self.draft = draft
+        self.picks: List[TeamPair] = []
+        self.role_counts = np.zeros(len(Role), dtype=np.int16)
+        self.lane_counts = np.zeros(len(Lane), dtype=np.int16)
+        self.damage_counts = np.zeros(len(DamageType), dtype=np.int16)
+        self.jungle_hero: Optional[str] = None
+        self.roam_hero: Optional[str] = None
+        
+        for hero_lane in team or []:
+            self.add_pick(hero_lane)
+    
+    def _apply(self, pick: TeamPair, sign: int):
+        hero, lane = pick
+        hero_id = self.draft.hero_id.get(hero)
+        if hero_id is not None:
+            self.role_counts += sign * self.draft.role_vector_arr[hero_id]
+            self.damage_counts += sign * self.draft.damage_vector_arr[hero_id]
+        if lane in LANE_BITS:
+            self.lane_counts[LANE_BITS[lane].bit_length() - 1] += sign
+    
+    def add_pick(self, hero_lane: Union[str, TeamPair]):
+        pick = self.draft._normalize_pick(hero_lane)
+        self.picks.append(pick)
+        self._apply(pick, 1)
+        
+        # Hero pertama di lane jungle/roam yang dipakai (sama dengan get_jungle_hero/get_roam_hero)
+        hero, lane = pick
+        if lane == "jungle" and self.jungle_hero is None:
+            self.jungle_hero = hero
+        elif lane == "roam" and self.roam_hero is None:
+            self.roam_hero = hero
+    
+    def remove_pick(self, hero_lane: Union[str, TeamPair]):
+        pick = self.draft._normalize_pick(hero_lane)
+        self.picks.remove(pick)
+        self._apply(pick, -1)
+        
+        _, lane = pick
+        if lane == "jungle":
+            self.jungle_hero = self.draft.get_jungle_hero(self.picks)
+        elif lane == "roam":
+            self.roam_hero = self.draft.get_roam_hero(self.picks)
+    
+    @property
+    def role_mask(self) -> int:
+        return sum(ROLE_BITS[r.value] for r, c in zip(Role, self.role_counts) if c > 0)
+    
+    @property
+    def lane_mask(self) -> int:
+        """Lane yang sudah terisi hero dengan spesifikasi lane"""
+        return sum(LANE_BITS[l.value] for l, c in zip(Lane, self.lane_counts) if c > 0)
+    
+    @property
+    def damage_mask(self) -> int:
+        return sum(DAMAGE_BITS[d.value] for d, c in zip(DamageType, self.damage_counts) if c > 0)
+    
+    def jungle_roam_valid(self) -> bool:
+        """Sama dengan DraftSystem.valid_jungle_roam_combination"""
+        jungle_hero, roam_hero = self.jungle_hero, self.roam_hero
+        if not jungle_hero or not roam_hero:
+            return True
+        
+        memiliki_role = self.draft.memiliki_role
+        if memiliki_role(jungle_hero, "assassin") and memiliki_role(roam_hero, "tank"):
+            return True
+        if (memiliki_role(jungle_hero, "tank") or memiliki_role(jungle_hero, "fighter")) and \
+           memiliki_role(roam_hero, "support"):
+            return True
+        return False
+    
+    def analysis(self) -> TeamAnalysis:
+        missing_lanes = [l.value for l, c in zip(Lane, self.lane_counts) if c == 0]
+        
+        damage_mask = self.damage_mask
+        balanced = len(self.picks) <= 1 or (
+            (damage_mask & DAMAGE_BITS["physical"]) != 0 and (damage_mask & DAMAGE_BITS["magic"]) != 0
+        )
+        
+        return TeamAnalysis(
+            role_counts={r.value: int(c) for r, c in zip(Role, self.role_counts)},
+            lane_counts={l.value: int(c) for l, c in zip(Lane, self.lane_counts)},
+            role_diversity=int(np.count_nonzero(self.role_counts)),
+            missing_lanes=missing_lanes,
+            damage_balance="balanced" if balanced else "unbalanced",
+            jungle_roam_valid="valid" if self.jungle_roam_valid() else "invalid",
+            lane_validation={
+                "valid": len(missing_lanes) == 0,
+                "missing_lanes": missing_lanes
+            }
+        )
+
+
 # ===== TESTING =====
 if __name__ == "__main__":
     # Initialize system
@@ -672,3 +884,32 @@ if __name__ == "__main__":
         print(f"   Missing Lanes: {result.team_analysis.missing_lanes}")
         print(f"   Damage Balance: {result.team_analysis.damage_balance}")
         print(f"   Jungle-Roam: {result.team_analysis.jungle_roam_valid}")
+    
+    # Test 4: Paritas scoring (kernel Numba == NumPy == calculate_priority)
+    print("\n" + "="*60)
+    print("TEST 4: Paritas scoring kernel / NumPy / calculate_priority")
+    print("="*60)
+    rng = random.Random(0)
+    names = sorted(draft.heroes)
+    lanes = ["gold", "exp", "mid", "jungle", "roam"]
+    has_numba = draft_kernels.HAS_NUMBA
+    mismatches = 0
+    for _ in range(300):
+        picked = rng.sample(names, 9)
+        enemy = picked[:rng.randint(0, 5)]
+        team = [f"{h}-{lane}" for h, lane in zip(picked[5:], rng.sample(lanes, rng.randint(0, 4)))]
+        ctx = draft.build_team_context(enemy, team, rng.choice(lanes))
+        candidates = np.arange(len(draft.hero_name), dtype=np.intp)
+        scores = []
+        for use_numba in {has_numba, False}:
+            draft_kernels.HAS_NUMBA = use_numba
+            scores.append(draft.score_all(ctx, candidates))
+        draft_kernels.HAS_NUMBA = has_numba
+        scalar = np.array([draft.calculate_priority(draft.hero_name[i], ctx)[0] for i in candidates])
+        if ctx.user_lane_filled:
+            # calculate_priority memberi penalti duplikasi lane yang tidak ada di score_all
+            scalar += 50 * np.array([draft.memiliki_lane(draft.hero_name[i], ctx.user_lane) for i in candidates])
+        if not all(np.allclose(score, scalar) for score in scores):
+            mismatches += 1
+    kernel = "Numba + NumPy" if has_numba else "NumPy saja (Numba tidak terpasang)"
+    print(f"{'✅' if mismatches == 0 else '❌'} {kernel}: {mismatches} draft tidak cocok dari 300")
@@ -0,0 +1,19 @@
+from functools import lru_cache
+
+import google.generativeai as genai
+from config import load_config
+
+@lru_cache()
+def configure_gemini():
+    """Validasi API key dan konfigurasi client Gemini sekali per proses"""
+    config = load_config()
+    api_key = config.get_gemini_api_key()
+    if not api_key or api_key == "YOUR_GEMINI_API_KEY":
+        raise ValueError("Please set your Gemini API key in config.toml")
+    
+    genai.configure(api_key=api_key)
+
+def create_model(**kwargs) -> genai.GenerativeModel:
+    """GenerativeModel dengan model name dari config (dipakai TextToCypher dan ResponseGenerator)"""
+    configure_gemini()
+    return genai.GenerativeModel(load_config().get_gemini_model_name(), **kwargs)
@@ -52,78 +52,101 @@ class PrologToGraph:
                 facts.append((predicate, arg1, arg2))
         return facts
 
+    def create_indexes(self, session):
+        """Index untuk lookup node berdasarkan id/name (dipakai saat ingest dan query)"""
+        session.run("CREATE INDEX hero_id IF NOT EXISTS FOR (h:Hero) ON (h.id)")
+        session.run("CREATE INDEX hero_name IF NOT EXISTS FOR (h:Hero) ON (h.name)")
+        for label in ["Role", "Lane", "Specialty", "DamageType"]:
+            session.run(f"CREATE INDEX {label.lower()}_id IF NOT EXISTS FOR (n:{label}) ON (n.id)")
+
+    def merge_hero_attribute(self, session, rows, label, relationship, with_name=True):
+        """
+        MERGE node atribut (Role, Lane, dll) dan relasi dari hero dalam satu query UNWIND
+        
+        Args:
+            rows: List dict {"hero": ..., "target": ...}
+            label: Label node atribut (contoh: "Role")
+            relationship: Tipe relasi dari Hero ke node atribut (contoh: "HAS_ROLE")
+            with_name: Set property name dari id (underscore diganti spasi)
+        """
+        node_props = "{id: row.target, name: replace(row.target, '_', ' ')}" if with_name else "{id: row.target}"
+        session.run(f"""
+            UNWIND $rows AS row
+            MERGE (n:{label} {node_props})
+            WITH row, n
+            MATCH (h:Hero {{id: row.hero}})
+            MERGE (h)-[:{relationship}]->(n)
+        """, rows=rows)
+
+    def merge_hero_relationship(self, session, rows, relationship):
+        """MERGE relasi hero ke hero dalam satu query UNWIND"""
+        session.run(f"""
+            UNWIND $rows AS row
+            MATCH (h1:Hero {{id: row.hero}}), (h2:Hero {{id: row.target}})
+            MERGE (h1)-[:{relationship}]->(h2)
+        """, rows=rows)
+
     def ingest_data(self):
         with self.driver.session() as session:
+            print("Creating indexes...")
+            self.create_indexes(session)
+
             # LOAD HEROES (Base Nodes)
             print("Loading Heroes...")
             heroes = self.parse_prolog_file("hero.pl")
-            for pred, hero_name, _ in heroes:
-                if pred == "hero":
-                    session.run("MERGE (h:Hero {id: $name, name: replace($name, '_', ' ')})", name=hero_name)
+            session.run("""
+                UNWIND $names AS name
+                MERGE (h:Hero {id: name, name: replace(name, '_', ' ')})
+            """, names=[hero_name for pred, hero_name, _ in heroes if pred == "hero"])
 
             # LOAD ROLES
             print("Loading Roles...")
             roles = self.parse_prolog_file("role.pl")
-            for pred, hero_name, role_name in roles:
-                if pred == "memiliki_role":
-                    session.run("MERGE (r:Role {id: $rname, name: replace($rname, '_', ' ')})", rname=role_name)
-                    session.run("""
-                        MATCH (h:Hero {id: $hname}), (r:Role {id: $rname})
-                        MERGE (h)-[:HAS_ROLE]->(r)
-                    """, hname=hero_name, rname=role_name)
+            self.merge_hero_attribute(session, [
+                {"hero": hero_name, "target": role_name}
+                for pred, hero_name, role_name in roles if pred == "memiliki_role"
+            ], "Role", "HAS_ROLE")
 
             # LOAD LANES
             print("Loading Lanes...")
             lanes = self.parse_prolog_file("lane.pl")
-            for pred, hero_name, lane_name in lanes:
-                if pred == "memiliki_lane":
-                    session.run("MERGE (l:Lane {id: $lname, name: replace($lname, '_', ' ')})", lname=lane_name)
-                    session.run("""
-                        MATCH (h:Hero {id: $hname}), (l:Lane {id: $lname})
-                        MERGE (h)-[:SUITED_FOR]->(l)
-                    """, hname=hero_name, lname=lane_name)
+            self.merge_hero_attribute(session, [
+                {"hero": hero_name, "target": lane_name}
+                for pred, hero_name, lane_name in lanes if pred == "memiliki_lane"
+            ], "Lane", "SUITED_FOR")
 
             # LOAD SPECIALTIES
             print("Loading Specialties...")
             specs = self.parse_prolog_file("specialty.pl")
-            for pred, hero_name, spec_name in specs:
-                if pred == "has_specialty":
-                    session.run("MERGE (s:Specialty {id: $sname, name: replace($sname, '_', ' ')})", sname=spec_name)
-                    session.run("""
-                        MATCH (h:Hero {id: $hname}), (s:Specialty {id: $sname})
-                        MERGE (h)-[:HAS_SPECIALTY]->(s)
-                    """, hname=hero_name, sname=spec_name)
+            self.merge_hero_attribute(session, [
+                {"hero": hero_name, "target": spec_name}
+                for pred, hero_name, spec_name in specs if pred == "has_specialty"
+            ], "Specialty", "HAS_SPECIALTY")
 
             # LOAD DAMAGE TYPE
             print("Loading Damage Types...")
             dtypes = self.parse_prolog_file("damage_type.pl")
-            for pred, hero_name, dtype in dtypes:
-                if pred == "memiliki_damage_type" and dtype != 'true': # Skip fakta 'true'
-                    session.run("MERGE (d:DamageType {id: $dname})", dname=dtype)
-                    session.run("""
-                        MATCH (h:Hero {id: $hname}), (d:DamageType {id: $dname})
-                        MERGE (h)-[:DEALS_DAMAGE]->(d)
-                    """, hname=hero_name, dname=dtype)
+            self.merge_hero_attribute(session, [
+                {"hero": hero_name, "target": dtype}
+                for pred, hero_name, dtype in dtypes
+                if pred == "memiliki_damage_type" and dtype != 'true'  # Skip fakta 'true'
+            ], "DamageType", "DEALS_DAMAGE", with_name=False)
 
             # LOAD COUNTERS (Hero ke Hero)
             print("Loading Counters...")
             counters = self.parse_prolog_file("counter.pl")
-            for pred, hero1, hero2 in counters:
-                if pred == "iscounter":
-                    session.run("""
-                        MATCH (h1:Hero {id: $n1}), (h2:Hero {id: $n2})
-                        MERGE (h1)-[:COUNTERS]->(h2)
-                    """, n1=hero1, n2=hero2)
+            self.merge_hero_relationship(session, [
+                {"hero": hero1, "target": hero2}
+                for pred, hero1, hero2 in counters if pred == "iscounter"
+            ], "COUNTERS")
 
             # LOAD COMPATIBILITY (Hero ke Hero)
             print("Loading Compatibility...")
             comps = self.parse_prolog_file("compatible.pl")
-            for pred, hero1, hero2 in comps:
-                if pred == "compatible":
-                    session.run("""
-                        MATCH (h1:Hero {id: $n1}), (h2:Hero {id: $n2})
-                        MERGE (h1)-[:COMPATIBLE_WITH]->(h2)
-                    """, n1=hero1, n2=hero2)
+            self.merge_hero_relationship(session, [
+                {"hero": hero1, "target": hero2}
+                for pred, hero1, hero2 in comps if pred == "compatible"
+            ], "COMPATIBLE_WITH")
 
         print("Data ingestion completed.")
 
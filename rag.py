@@ -1,5 +1,5 @@
 from database import GraphDatabaseDriver
-from response_generator import ResponseGenerator
+from response_generator import get_response_generator
 from text_to_cypher import TextToCypher
 
 with GraphDatabaseDriver() as driver:
@@ -10,7 +10,7 @@ with GraphDatabaseDriver() as driver:
     ttc = TextToCypher(schema)
 
     print("Preparing response generator pipeline ....")
-    generator = ResponseGenerator(schema)
+    generator = get_response_generator(schema)
 
     interrupt = False
     print("(Interrupt to stop.)")
@@ -52,8 +52,10 @@ with GraphDatabaseDriver() as driver:
 
             if results:
                 print("Generating response ....")
-                response = generator(question, query, query_result_str)
-                print(f"\n💬 {response}\n")
+                print("\n💬 ", end="", flush=True)
+                for chunk in generator.stream(question, query, query_result_str):
+                    print(chunk, end="", flush=True)
+                print("\n")
             else:
                 print("\n❌ No results found.\n")
     
@@ -1,5 +1,8 @@
+import re
+from functools import lru_cache
+
 import google.generativeai as genai
-from config import load_config
+from gemini_client import create_model
 
 PROMPT_TEMPLATE = """
 <SCHEMA>
@@ -16,39 +19,61 @@ Query result:
 Answer:
 """.strip()
 
+SYSTEM_INSTRUCTION = "You are a Mobile Legends knowledge assistant. Answer the user question ONLY using the provided Neo4j query results. Do not make up hero names or information. If the query returned no results, say so clearly. Keep answers concise and accurate."
+
 class ResponseGenerator:
     def __init__(self, schema: str):
         self._schema = schema
         
-        config = load_config()
-        api_key = config.get_gemini_api_key()
-
-        if not api_key or api_key == "YOUR_GEMINI_API_KEY":
-            raise ValueError("Please set your Gemini API key in config.toml")
+        # System instruction dikirim sebagai bagian konfigurasi model, bukan ditempel di setiap prompt.
+        # Sengaja tanpa max_output_tokens: Gemini 2.5 menghitung token "thinking" ke batas tersebut,
+        # sehingga cap yang ketat bisa menghasilkan response tanpa teks. Model berhenti sendiri di EOS.
+        self._model = create_model(
+            system_instruction=SYSTEM_INSTRUCTION,
+            generation_config=genai.GenerationConfig(candidate_count=1, temperature=0.0)
+        )
         
-        genai.configure(api_key=api_key)
-        self._model = genai.GenerativeModel('gemini-2.5-flash')
+        # Schema dirender sekali; sisa template dipecah di placeholder dinamis
+        # (question, query, query result) sehingga per request cukup join string
+        self._prompt_parts = re.split(
+            r"<QUESTION>|<QUERY>|<QUERY-RESULT-STR>",
+            PROMPT_TEMPLATE.replace("<SCHEMA>", schema)
+        )
+
+    def _build_prompt(self, question: str, query: str, query_result_str: str):
+        head, after_question, after_query, tail = self._prompt_parts
+        return head + question + after_question + query + after_query + query_result_str + tail
 
     def __call__(self, question: str, query: str, query_result_str: str):
-        prompt = PROMPT_TEMPLATE
-        prompt = prompt.replace("<SCHEMA>", self._schema)
-        prompt = prompt.replace("<QUESTION>", question)
-        prompt = prompt.replace("<QUERY>", query)
-        prompt = prompt.replace("<QUERY-RESULT-STR>", query_result_str)
+        response = self._model.generate_content(self._build_prompt(question, query, query_result_str))
+        return response.text.strip()
 
-        system_instruction = "You are a Mobile Legends knowledge assistant. Answer the user question ONLY using the provided Neo4j query results. Do not make up hero names or information. If the query returned no results, say so clearly. Keep answers concise and accurate."
-        
-        full_prompt = f"{system_instruction}\n\n{prompt}"
-        
-        response = self._model.generate_content(full_prompt)
+    def stream(self, question: str, query: str, query_result_str: str):
+        """Yield potongan jawaban selagi di-generate"""
+        response = self._model.generate_content(
+            self._build_prompt(question, query, query_result_str),
+            stream=True
+        )
+        for chunk in response:
+            # Chunk terakhir bisa hanya berisi finish_reason tanpa teks
+            if chunk.parts:
+                yield chunk.text
+
+    async def generate_async(self, question: str, query: str, query_result_str: str):
+        response = await self._model.generate_content_async(self._build_prompt(question, query, query_result_str))
         return response.text.strip()
 
+@lru_cache()
+def get_response_generator(schema: str) -> ResponseGenerator:
+    """Satu instance ResponseGenerator per schema per proses"""
+    return ResponseGenerator(schema)
+
 if __name__ == "__main__":
     with open("schema_example.txt") as fp:
         schema = fp.read().strip()
 
     print("Preparing pipeline ....")
-    generator = ResponseGenerator(schema)
+    generator = get_response_generator(schema)
 
     question = "List all players and their levels."
     query = """
@@ -0,0 +1,69 @@
+import threading
+from collections import OrderedDict
+
+import faiss
+import numpy as np
+from sentence_transformers import SentenceTransformer
+
+class SemanticCache:
+    """Cache jawaban /chat berdasarkan kemiripan embedding pertanyaan"""
+
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", threshold: float = 0.87, max_entries: int = 1024,
+                 backend: str = "torch"):
+        # backend "onnx"/"openvino" menjalankan embedder lewat ONNX Runtime/OpenVINO
+        # (butuh sentence-transformers[onnx] / [openvino]), lebih cepat di CPU
+        self._model = SentenceTransformer(model_name, backend=backend)
+        self._threshold = threshold
+        self._max_entries = max_entries
+
+        # Inner product atas vektor ternormalisasi = cosine similarity
+        dim = self._model.get_sentence_embedding_dimension()
+        self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self._entries = OrderedDict()  # id -> (question, cypher, results, answer)
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(question: str) -> str:
+        return " ".join(question.lower().split())
+
+    def embed(self, question: str) -> np.ndarray:
+        vec = self._model.encode(
+            [self._normalize(question)],
+            normalize_embeddings=True,
+            convert_to_numpy=True
+        )
+        return vec.astype(np.float32)
+
+    def lookup(self, vec: np.ndarray):
+        """Return (question, cypher, results, answer) jika ada entry yang cukup mirip"""
+        with self._lock:
+            if not self._entries:
+                return None
+
+            scores, ids = self._index.search(vec, 1)
+            entry_id = int(ids[0][0])
+            if entry_id < 0 or scores[0][0] < self._threshold:
+                return None
+
+            # LRU: tandai entry sebagai baru dipakai
+            self._entries.move_to_end(entry_id)
+            return self._entries[entry_id]
+
+    def add(self, vec: np.ndarray, question: str, cypher: str, results: list, answer: str):
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+
+            self._index.add_with_ids(vec, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = (question, cypher, results, answer)
+
+            # Evict entry yang paling lama tidak dipakai
+            while len(self._entries) > self._max_entries:
+                old_id, _ = self._entries.popitem(last=False)
+                self._index.remove_ids(np.array([old_id], dtype=np.int64))
+
+    def clear(self):
+        with self._lock:
+            self._index.reset()
+            self._entries.clear()
@@ -1,28 +1,13 @@
-import google.generativeai as genai
-from config import load_config
+from gemini_client import create_model
 
-class TextToCypher:
-    def __init__(self, schema: str):
-        self._schema = schema
-        
-        # Load Gemini API key from config
-        config = load_config()
-        api_key = config.get_gemini_api_key()
-        if not api_key or api_key == "YOUR_GEMINI_API_KEY":
-            raise ValueError("Please set your Gemini API key in config.toml")
-        
-        genai.configure(api_key=api_key)
-        self._model = genai.GenerativeModel('gemini-2.5-flash')
-
-    def __call__(self, question: str):
-        # Prompt template
-        prompt = f"""
+# Prompt template
+PROMPT_TEMPLATE = """
         You are an expert Neo4j developer converting natural language questions into Cypher queries.
 
         ### DATABASE SCHEMA INSTRUCTIONS:
         Strictly use ONLY the node labels, relationship types, and properties defined in the schema below. Do not invent new relationships or properties.
 
-        {self._schema}
+        {schema}
 
         ### SYNTAX RULES:
         1. **Directionality:** Pay attention to relationship directions (->, <-, or -).
@@ -53,9 +38,21 @@ class TextToCypher:
         Question: {question}
         Cypher:
         """
+
+class TextToCypher:
+    def __init__(self, schema: str):
+        self._schema = schema
+        self._model = create_model()
         
-        response = self._model.generate_content(prompt)
-        generated_text = response.text.strip()
+        # Bagian statis prompt (instruksi + schema) dirender sekali, per request tinggal sisipkan pertanyaan
+        head, _, self._prompt_suffix = PROMPT_TEMPLATE.partition("{question}")
+        self._prompt_prefix = head.format(schema=schema)
+
+    def _build_prompt(self, question: str):
+        return self._prompt_prefix + question + self._prompt_suffix
+
+    def _clean_output(self, generated_text: str):
+        generated_text = generated_text.strip()
         
         # Clean up markdown code blocks if present
         if '```' in generated_text:
@@ -71,7 +68,17 @@ class TextToCypher:
                     code_lines.append(line)
             generated_text = '\n'.join(code_lines).strip()
         
-        return generated_text
+        # Normalisasi whitespace agar query yang sama menghasilkan string yang identik
+        # (Neo4j meng-cache query plan berdasarkan string query)
+        return '\n'.join(line.strip() for line in generated_text.splitlines() if line.strip())
+
+    def __call__(self, question: str):
+        response = self._model.generate_content(self._build_prompt(question))
+        return self._clean_output(response.text)
+
+    async def generate_async(self, question: str):
+        response = await self._model.generate_content_async(self._build_prompt(question))
+        return self._clean_output(response.text)
 
 if __name__ == "__main__":
     with open("schema_example.txt") as fp: